@@ -1,6 +1,7 @@
 import streamlit as st
 import json
 import os
+import sys
 from datetime import datetime
 import pandas as pd
 import plotly.express as px
@@ -145,18 +146,124 @@ if "search_results" not in st.session_state:
     st.session_state.search_results = []
 if "search_performed" not in st.session_state:
     st.session_state.search_performed = False
+if "authors" not in st.session_state:
+    st.session_state.authors = {}
+if "genres" not in st.session_state:
+    st.session_state.genres = {}
+if "invalid_records" not in st.session_state:
+    st.session_state.invalid_records = []
+if "library_signature" not in st.session_state:
+    st.session_state.library_signature = None
+if "memory_report" not in st.session_state:
+    st.session_state.memory_report = None
+
+# Book record
+class Book:
+    """A compact book record.
+
+    Uses __slots__ instead of a per-book dict, and author/genre hold references
+    to the shared strings in the interned author and genre tables.
+    """
+    __slots__ = ("title", "author", "year", "genre", "read")
+
+    def __init__(self, title, author, year, genre, read):
+        self.title = title
+        self.author = author
+        self.year = year
+        self.genre = genre
+        self.read = read
+
+    @classmethod
+    def from_dict(cls, data, authors, genres):
+        """Create a book from its JSON dictionary form, interning author and genre.
+
+        Raises KeyError, TypeError or ValueError if the record is malformed.
+        """
+        title, author, genre = data["title"], data["author"], data["genre"]
+        year, read = data["year"], data["read"]
+        if not all(isinstance(value, str) for value in (title, author, genre)):
+            raise TypeError("title, author and genre must be strings")
+        if not isinstance(year, int) or isinstance(year, bool):
+            raise ValueError(f"invalid year {year!r}")
+        if not isinstance(read, bool):
+            raise ValueError(f"invalid read status {read!r}")
+        return cls(title, intern_value(authors, author), year, intern_value(genres, genre), read)
+
+    def to_dict(self):
+        """Return the JSON dictionary form of the book."""
+        return {
+            "title": self.title,
+            "author": self.author,
+            "year": self.year,
+            "genre": self.genre,
+            "read": self.read
+        }
 
 # Functions
+def intern_value(table, value):
+    """Return the shared copy of a string from an intern table, adding it if new."""
+    return table.setdefault(value, value)
+
+def set_library(records):
+    """Replace the library with books built from JSON records.
+
+    The library and fresh intern tables are only assigned once every record has
+    been processed. Malformed records are skipped and kept aside so save_library
+    writes them back unchanged; they are reported once when they first appear.
+    """
+    library = []
+    authors = {}
+    genres = {}
+    invalid_records = []
+    
+    for record in records:
+        try:
+            library.append(Book.from_dict(record, authors, genres))
+        except (KeyError, TypeError, ValueError) as e:
+            invalid_records.append(record)
+    
+    if invalid_records and invalid_records != st.session_state.invalid_records:
+        st.warning(f"Skipped {len(invalid_records)} invalid book records in {LIBRARY_FILE}.")
+    
+    st.session_state.library = library
+    st.session_state.authors = authors
+    st.session_state.genres = genres
+    st.session_state.invalid_records = invalid_records
+    st.session_state.memory_report = None
+
+def file_signature():
+    """Return the modification time and size of the library file."""
+    stat = os.stat(LIBRARY_FILE)
+    return (stat.st_mtime_ns, stat.st_size)
+
 def load_library():
-    """Load the library from a JSON file if it exists."""
+    """Load the library from a JSON file if it exists.
+
+    The file is only parsed again when it has changed since it was last loaded
+    or saved by this session, so Book references stay valid across reruns.
+    """
     if os.path.exists(LIBRARY_FILE):
+        signature = file_signature()
+        if signature == st.session_state.library_signature:
+            return
+        
+        # Search results reference books from the previous load, so drop them
+        st.session_state.search_results = []
+        st.session_state.search_performed = False
+        
         try:
             with open(LIBRARY_FILE, 'r') as file:
-                st.session_state.library = json.load(file)
+                records = json.load(file)
+            if not isinstance(records, list):
+                raise ValueError("expected a list of books")
         except Exception as e:
             st.error(f"Error loading library: {e}")
             # Create default library
             create_default_library()
+            return
+        
+        set_library(records)
+        st.session_state.library_signature = signature
     else:
         # Create default library for first run
         create_default_library()
@@ -236,14 +343,16 @@ def create_default_library():
         }
     ]
     
-    st.session_state.library = default_books
+    set_library(default_books)
     save_library()
 
 def save_library():
     """Save the library to a JSON file."""
     try:
         with open(LIBRARY_FILE, 'w') as file:
-            json.dump(st.session_state.library, file, indent=4)
+            records = [book.to_dict() for book in st.session_state.library]
+            json.dump(records + st.session_state.invalid_records, file, indent=4)
+        st.session_state.library_signature = file_signature()
         return True
     except Exception as e:
         st.error(f"Error saving library: {e}")
@@ -259,42 +368,118 @@ def add_book(title, author, year, genre, read_status):
     """Add a new book to the library."""
     # Check if book already exists
     for book in st.session_state.library:
-        if book["title"].lower() == title.lower() and book["author"].lower() == author.lower():
+        if book.title.lower() == title.lower() and book.author.lower() == author.lower():
             return False
     
-    # Create book dictionary
-    book = {
-        "title": title,
-        "author": author,
-        "year": int(year),
-        "genre": genre,
-        "read": read_status
-    }
+    book = Book(
+        title,
+        intern_value(st.session_state.authors, author),
+        int(year),
+        intern_value(st.session_state.genres, genre),
+        read_status
+    )
     
     st.session_state.library.append(book)
+    st.session_state.memory_report = None
     save_library()
     return True
 
-def remove_book(index):
+def find_book(book):
+    """Return the library index of a book by identity, or None if it is gone."""
+    return next((index for (index, b) in enumerate(st.session_state.library) if b is book), None)
+
+def remove_book(book):
     """Remove a book from the library."""
+    index = find_book(book)
+    if index is None:
+        st.warning("This book is no longer in your library.")
+        return
+    
     st.session_state.library.pop(index)
+    st.session_state.search_results = [b for b in st.session_state.search_results if b is not book]
+    
+    # Drop the author and genre from the intern tables once no book uses them
+    if not any(b.author is book.author for b in st.session_state.library):
+        st.session_state.authors.pop(book.author, None)
+    if not any(b.genre is book.genre for b in st.session_state.library):
+        st.session_state.genres.pop(book.genre, None)
+    st.session_state.memory_report = None
     save_library()
 
-def toggle_read_status(index):
+def toggle_read_status(book):
     """Toggle the read status of a book."""
-    st.session_state.library[index]["read"] = not st.session_state.library[index]["read"]
+    if find_book(book) is None:
+        st.warning("This book is no longer in your library.")
+        return
+    
+    book.read = not book.read
     save_library()
 
 def search_books(search_term, search_field):
-    """Search for books in the library."""
-    st.session_state.search_results = []
-    
-    for book in st.session_state.library:
-        if search_term.lower() in book[search_field].lower():
-            st.session_state.search_results.append(book)
+    """Search for books in the library, storing references to matching books."""
+    term = search_term.lower()
+    st.session_state.search_results = [
+        book for book in st.session_state.library
+        if term in getattr(book, search_field).lower()
+    ]
     
     st.session_state.search_performed = True
 
+def library_dataframe():
+    """Build a dataframe of the library column by column."""
+    library = st.session_state.library
+    return pd.DataFrame({
+        "title": [book.title for book in library],
+        "author": [book.author for book in library],
+        "year": [book.year for book in library],
+        "genre": [book.genre for book in library],
+        "read": [book.read for book in library]
+    })
+
+def memory_report():
+    """Estimate per-book memory for dictionary records versus compact records.
+
+    The estimate is cached until the library is reloaded or a book is added or
+    removed.
+    """
+    if st.session_state.memory_report is not None:
+        return st.session_state.memory_report
+    
+    library = st.session_state.library
+    if not library:
+        return None
+    
+    total = len(library)
+    
+    # Every book has the same five keys, so one sample gives the size of each
+    # record container without building a dict per book
+    dict_size = sys.getsizeof(library[0].to_dict())
+    book_size = sys.getsizeof(library[0])
+    
+    # Title and year are held per book in both layouts
+    shared_bytes = sum(sys.getsizeof(book.title) + sys.getsizeof(book.year) for book in library)
+    
+    # Dictionary records hold their own author and genre strings for every book
+    string_bytes = sum(sys.getsizeof(book.author) + sys.getsizeof(book.genre) for book in library)
+    dict_bytes = total * dict_size + shared_bytes + string_bytes
+    
+    # Compact records share author and genre strings through the intern tables
+    tables = (st.session_state.authors, st.session_state.genres)
+    table_bytes = sum(
+        sys.getsizeof(table) + sum(sys.getsizeof(value) for value in table)
+        for table in tables
+    )
+    compact_bytes = total * book_size + shared_bytes + table_bytes
+    
+    st.session_state.memory_report = {
+        "books": total,
+        "authors": len(st.session_state.authors),
+        "genres": len(st.session_state.genres),
+        "dict_per_book": dict_bytes / total,
+        "compact_per_book": compact_bytes / total
+    }
+    return st.session_state.memory_report
+
 # Load library data on app start
 load_library()
 
@@ -326,7 +511,7 @@ with st.sidebar:
     
     if st.session_state.library:
         total_books = len(st.session_state.library)
-        read_books = sum(1 for book in st.session_state.library if book["read"])
+        read_books = sum(1 for book in st.session_state.library if book.read)
         unread_books = total_books - read_books
         percentage_read = (read_books / total_books) * 100 if total_books > 0 else 0
         
@@ -337,10 +522,10 @@ with st.sidebar:
         # Genre breakdown
         genres = {}
         for book in st.session_state.library:
-            if book["genre"] in genres:
-                genres[book["genre"]] += 1
+            if book.genre in genres:
+                genres[book.genre] += 1
             else:
-                genres[book["genre"]] = 1
+                genres[book.genre] = 1
         
         st.markdown("**Genre Breakdown:**")
         for genre, count in genres.items():
@@ -356,7 +541,7 @@ if st.session_state.current_page == "Dashboard":
         st.info("Your library is empty. Add some books to get started!")
     else:
         # Create dataframe for analysis
-        df = pd.DataFrame(st.session_state.library)
+        df = library_dataframe()
         
         # Top stats row
         col1, col2, col3 = st.columns(3)
@@ -472,18 +657,28 @@ if st.session_state.current_page == "Dashboard":
         recent_books.reverse()  # Latest first
         
         for book in recent_books:
-            read_status = "Read" if book["read"] else "Unread"
-            badge_class = "read-badge" if book["read"] else "unread-badge"
+            read_status = "Read" if book.read else "Unread"
+            badge_class = "read-badge" if book.read else "unread-badge"
             
             st.markdown(f"""
             <div class="book-card">
-                <div class="book-title">{book["title"]}</div>
-                <div class="book-author">by {book["author"]}</div>
+                <div class="book-title">{book.title}</div>
+                <div class="book-author">by {book.author}</div>
                 <div class="book-details">
-                    {book["genre"]} • {book["year"]} • <span class="{badge_class}">{read_status}</span>
+                    {book.genre} • {book.year} • <span class="{badge_class}">{read_status}</span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
+        
+        # Memory usage
+        st.markdown("<h3>Memory Usage</h3>", unsafe_allow_html=True)
+        
+        report = memory_report()
+        saving = 100 - (report["compact_per_book"] / report["dict_per_book"] * 100)
+        
+        st.markdown(f"**Dictionary records (estimated):** {report['dict_per_book']:.0f} bytes per book")
+        st.markdown(f"**Compact records (estimated):** {report['compact_per_book']:.0f} bytes per book ({saving:.1f}% smaller)")
+        st.markdown(f"**Interned:** {report['authors']} authors, {report['genres']} genres across {report['books']} books")
 
 elif st.session_state.current_page == "View Library":
     st.markdown("<h2>📚 Your Library</h2>", unsafe_allow_html=True)
@@ -497,7 +692,7 @@ elif st.session_state.current_page == "View Library":
         with col1:
             genre_filter = st.selectbox(
                 "Filter by Genre", 
-                ["All"] + sorted(list(set(book["genre"] for book in st.session_state.library)))
+                ["All"] + sorted(list(set(book.genre for book in st.session_state.library)))
             )
         
         with col2:
@@ -506,26 +701,29 @@ elif st.session_state.current_page == "View Library":
         with col3:
             sort_by = st.selectbox("Sort by", ["Title", "Author", "Year (Newest)", "Year (Oldest)"])
         
-        # Apply filters
-        filtered_books = st.session_state.library.copy()
+        # Apply filters (filtered_books holds indices into the library)
+        library = st.session_state.library
+        filtered_books = range(len(library))
         
         if genre_filter != "All":
-            filtered_books = [book for book in filtered_books if book["genre"] == genre_filter]
+            filtered_books = [i for i in filtered_books if library[i].genre == genre_filter]
         
         if read_filter == "Read":
-            filtered_books = [book for book in filtered_books if book["read"]]
+            filtered_books = [i for i in filtered_books if library[i].read]
         elif read_filter == "Unread":
-            filtered_books = [book for book in filtered_books if not book["read"]]
+            filtered_books = [i for i in filtered_books if not library[i].read]
+        
+        filtered_books = list(filtered_books)
         
         # Apply sorting
         if sort_by == "Title":
-            filtered_books.sort(key=lambda x: x["title"])
+            filtered_books.sort(key=lambda i: library[i].title)
         elif sort_by == "Author":
-            filtered_books.sort(key=lambda x: x["author"])
+            filtered_books.sort(key=lambda i: library[i].author)
         elif sort_by == "Year (Newest)":
-            filtered_books.sort(key=lambda x: x["year"], reverse=True)
+            filtered_books.sort(key=lambda i: library[i].year, reverse=True)
         elif sort_by == "Year (Oldest)":
-            filtered_books.sort(key=lambda x: x["year"])
+            filtered_books.sort(key=lambda i: library[i].year)
         
         # Display books
         if not filtered_books:
@@ -534,31 +732,29 @@ elif st.session_state.current_page == "View Library":
             st.markdown(f"<p>Showing {len(filtered_books)} books</p>", unsafe_allow_html=True)
             st.markdown("---")
             
-            for i, book in enumerate(filtered_books):
+            for i, original_index in enumerate(filtered_books):
+                book = library[original_index]
                 col1, col2 = st.columns([4, 1])
                 
                 with col1:
-                    read_status = "Read" if book["read"] else "Unread"
-                    badge_class = "read-badge" if book["read"] else "unread-badge"
+                    read_status = "Read" if book.read else "Unread"
+                    badge_class = "read-badge" if book.read else "unread-badge"
                     
                     st.markdown(f"""
                     <div class="book-card">
-                        <div class="book-title">{book["title"]}</div>
-                        <div class="book-author">by {book["author"]}</div>
+                        <div class="book-title">{book.title}</div>
+                        <div class="book-author">by {book.author}</div>
                         <div class="book-details">
-                            {book["genre"]} • {book["year"]} • <span class="{badge_class}">{read_status}</span>
+                            {book.genre} • {book.year} • <span class="{badge_class}">{read_status}</span>
                         </div>
                     </div>
                     """, unsafe_allow_html=True)
                 
                 with col2:
-                    # Find the index in the original library
-                    original_index = next((index for (index, d) in enumerate(st.session_state.library) if d["title"] == book["title"] and d["author"] == book["author"]), None)
+                    st.button("Delete", key=f"delete_{i}", on_click=remove_book, args=(book,))
                     
-                    st.button("Delete", key=f"delete_{i}", on_click=remove_book, args=(original_index,))
-                    
-                    status_label = "Mark Unread" if book["read"] else "Mark Read"
-                    st.button(status_label, key=f"toggle_{i}", on_click=toggle_read_status, args=(original_index,))
+                    status_label = "Mark Unread" if book.read else "Mark Read"
+                    st.button(status_label, key=f"toggle_{i}", on_click=toggle_read_status, args=(book,))
 
 elif st.session_state.current_page == "Add Book":
     st.markdown("<h2>➕ Add a New Book</h2>", unsafe_allow_html=True)
@@ -639,27 +835,24 @@ elif st.session_state.current_page == "Search Books":
                     col1, col2 = st.columns([4, 1])
                     
                     with col1:
-                        read_status = "Read" if book["read"] else "Unread"
-                        badge_class = "read-badge" if book["read"] else "unread-badge"
+                        read_status = "Read" if book.read else "Unread"
+                        badge_class = "read-badge" if book.read else "unread-badge"
                         
                         st.markdown(f"""
                         <div class="book-card">
-                            <div class="book-title">{book["title"]}</div>
-                            <div class="book-author">by {book["author"]}</div>
+                            <div class="book-title">{book.title}</div>
+                            <div class="book-author">by {book.author}</div>
                             <div class="book-details">
-                                {book["genre"]} • {book["year"]} • <span class="{badge_class}">{read_status}</span>
+                                {book.genre} • {book.year} • <span class="{badge_class}">{read_status}</span>
                             </div>
                         </div>
                         """, unsafe_allow_html=True)
                     
                     with col2:
-                        # Find the index in the original library
-                        original_index = next((index for (index, d) in enumerate(st.session_state.library) if d["title"] == book["title"] and d["author"] == book["author"]), None)
-                        
-                        st.button("Delete", key=f"search_delete_{i}", on_click=remove_book, args=(original_index,))
+                        st.button("Delete", key=f"search_delete_{i}", on_click=remove_book, args=(book,))
                         
-                        status_label = "Mark Unread" if book["read"] else "Mark Read"
-                        st.button(status_label, key=f"search_toggle_{i}", on_click=toggle_read_status, args=(original_index,))
+                        status_label = "Mark Unread" if book.read else "Mark Read"
+                        st.button(status_label, key=f"search_toggle_{i}", on_click=toggle_read_status, args=(book,))
 
 # Footer
 st.markdown("---")